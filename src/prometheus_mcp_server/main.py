@@ -1,89 +1,166 @@
 #!/usr/bin/env python
 import sys
-import dotenv
-from prometheus_mcp_server.server import mcp, config, TransportType
-from prometheus_mcp_server.logging_config import setup_logging
+import functools
+from dataclasses import dataclass
+from typing import Any, Optional
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
+from prometheus_mcp_server.server import mcp, config, TransportType, SKIP_DOTENV, _TRANSPORT_VALUES
 
-# Initialize structured logging
-logger = setup_logging()
+# Structured logging is configured on first use rather than at import time
+_LOGGER = None
+
+def _log():
+    """Return the structured logger, configuring logging on first use."""
+    global _LOGGER
+    if _LOGGER is None:
+        from prometheus_mcp_server.logging_config import setup_logging
+        _LOGGER = setup_logging()
+    return _LOGGER
+
+_HTTP_TRANSPORTS = frozenset({TransportType.HTTP.value, TransportType.SSE.value})
+
+@functools.lru_cache(maxsize=1)
+def _load_dotenv_once() -> bool:
+    """Load the .env file once per process and remember whether one was found."""
+    if SKIP_DOTENV:
+        return False
+    import dotenv
+    return dotenv.load_dotenv()
+
+def reset_dotenv_cache():
+    """Forget the cached .env load result so the next setup re-reads the file."""
+    _load_dotenv_once.cache_clear()
+
+@dataclass(slots=True, frozen=True)
+class ResolvedMCPConfig:
+    """Snapshot of the MCP server transport settings."""
+    transport: Any
+    host: Optional[str]
+    port: Any
+
+@dataclass(slots=True, frozen=True)
+class ResolvedConfig:
+    """Snapshot of the server configuration taken once at boot."""
+    url: Optional[str]
+    username: Optional[str]
+    password: Optional[str]
+    token: Optional[str]
+    org_id: Optional[str]
+    mcp: Optional[ResolvedMCPConfig]
+
+@functools.cache
+def _resolved_config() -> ResolvedConfig:
+    """Read the configuration attributes once and reuse them for the rest of the boot.
+
+    Call ``_resolved_config.cache_clear()`` to pick up configuration changes (e.g. in tests).
+    """
+    mcp_config = config.mcp_server_config
+    return ResolvedConfig(
+        url=config.url,
+        username=config.username,
+        password=config.password,
+        token=config.token,
+        org_id=config.org_id,
+        mcp=ResolvedMCPConfig(
+            transport=mcp_config.mcp_server_transport,
+            host=mcp_config.mcp_bind_host,
+            port=mcp_config.mcp_bind_port,
+        ) if mcp_config else None,
+    )
+
+class McpSettings(BaseModel):
+    """Validated MCP server transport settings."""
+    model_config = ConfigDict(frozen=True, use_enum_values=True)
+
+    transport: TransportType
+    bind_host: str
+    bind_port: int
+
+    @field_validator("transport", mode="before")
+    @classmethod
+    def _normalize_transport(cls, value):
+        # The server config already lower-cases the env value; only normalize anything else
+        if value in _TRANSPORT_VALUES:
+            return value
+        return str(value).lower()
+
+@functools.cache
+def _mcp_settings() -> Optional[McpSettings]:
+    """Validate the MCP transport settings once and reuse the parsed result.
+
+    Raises:
+        ValidationError: If the transport or bind port is invalid
+    """
+    mcp_config = _resolved_config().mcp
+    if mcp_config is None:
+        return None
+    return McpSettings(
+        transport=mcp_config.transport,
+        bind_host=mcp_config.host,
+        bind_port=mcp_config.port,
+    )
 
 def setup_environment():
-    if dotenv.load_dotenv():
-        logger.info("Environment configuration loaded", source=".env file")
-    else:
-        logger.info("Environment configuration loaded", source="environment variables", note="No .env file found")
+    logger = _log()
+    cfg = _resolved_config()
+    boot_event = {
+        "dotenv_source": ".env file" if _load_dotenv_once() else "environment variables",
+    }
 
     # Prometheus URL is now optional - can be provided per-request
-    if config.url:
-        logger.info("Default Prometheus URL configured", url=config.url)
-    else:
-        logger.info(
-            "No default Prometheus URL configured",
-            note="Prometheus URL, username, and password must be provided with each tool call",
-            mode="credential-free"
-        )
+    boot_event["default_url"] = cfg.url if cfg.url else "not configured"
     
     # MCP Server configuration validation
-    mcp_config = config.mcp_server_config
-    if mcp_config:
-        if str(mcp_config.mcp_server_transport).lower() not in TransportType.values():
-            logger.error(
-                "Invalid mcp transport",
-                error="PROMETHEUS_MCP_SERVER_TRANSPORT environment variable is invalid",
-                suggestion="Please define one of these acceptable transports (http/sse/stdio)",
-                example="http"
-            )
-            return False
-
-        try:
-            if mcp_config.mcp_bind_port:
-                int(mcp_config.mcp_bind_port)
-        except (TypeError, ValueError):
-            logger.error(
-                "Invalid mcp port",
-                error="PROMETHEUS_MCP_BIND_PORT environment variable is invalid",
-                suggestion="Please define an integer",
-                example="8080"
-            )
-            return False
+    try:
+        settings = _mcp_settings()
+    except ValidationError as e:
+        logger.error(
+            "Invalid MCP config",
+            error="PROMETHEUS_MCP_SERVER_TRANSPORT or PROMETHEUS_MCP_BIND_PORT environment variable is invalid",
+            errors=e.errors(include_url=False, include_context=False),
+            hint="Use one of http/sse/stdio for the transport (e.g. http) and an integer port (e.g. 8080)",
+        )
+        return False
+    if settings:
+        boot_event.update(
+            mcp_transport=settings.transport,
+            mcp_host=settings.bind_host,
+            mcp_port=settings.bind_port,
+        )
     
     # Determine authentication method for default credentials
     auth_method = "none (credential-free mode)"
-    if config.username and config.password:
+    if cfg.username and cfg.password:
         auth_method = "basic_auth (default credentials configured)"
-    elif config.token:
+    elif cfg.token:
         auth_method = "bearer_token (default credentials configured)"
     
-    logger.info(
-        "Prometheus MCP Server configuration",
-        default_server_url=config.url if config.url else "not configured",
-        default_authentication=auth_method,
-        org_id=config.org_id if config.org_id else None,
-        mode="credential-free" if not config.url else "hybrid"
+    boot_event.update(
+        auth_method=auth_method,
+        org_id=cfg.org_id if cfg.org_id else None,
+        mode="credential-free" if not cfg.url else "hybrid",
     )
+    logger.info("prometheus_mcp_server.boot", **boot_event)
     
     return True
 
 def run_server():
     """Main entry point for the Prometheus MCP Server"""
+    logger = _log()
     # Setup environment
     if not setup_environment():
         logger.error("Environment setup failed, exiting")
         sys.exit(1)
     
-    mcp_config = config.mcp_server_config
-    transport = mcp_config.mcp_server_transport
-
-    http_transports = [TransportType.HTTP.value, TransportType.SSE.value]
-    if transport in http_transports:
-        mcp.run(transport=transport, host=mcp_config.mcp_bind_host, port=mcp_config.mcp_bind_port)
-        logger.info("Starting Prometheus MCP Server", 
-                transport=transport, 
-                host=mcp_config.mcp_bind_host,
-                port=mcp_config.mcp_bind_port)
-    else:
-        mcp.run(transport=transport)
-        logger.info("Starting Prometheus MCP Server", transport=transport)
+    settings = _mcp_settings()
+    transport = settings.transport
+
+    # mcp.run() blocks until shutdown, so announce the start before calling it
+    run_kwargs = {"transport": transport}
+    if transport in _HTTP_TRANSPORTS:
+        run_kwargs.update(host=settings.bind_host, port=settings.bind_port)
+    logger.info("Starting Prometheus MCP Server", **run_kwargs)
+    mcp.run(**run_kwargs)
 
 if __name__ == "__main__":
     run_server()
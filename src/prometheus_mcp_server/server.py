@@ -1,27 +1,139 @@
 #!/usr/bin/env python
 
 import os
+import re
 import json
-from typing import Any, Dict, List, Optional, Union
-from dataclasses import dataclass
+import logging
+import base64
+import asyncio
+import functools
+from collections import OrderedDict
+from types import MappingProxyType
+from urllib.parse import urlencode, urlsplit, urlunsplit
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+from dataclasses import dataclass, field
 import time
-from datetime import datetime, timedelta
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 
-import dotenv
-import requests
+import httpx
+import orjson
+from pydantic_core import to_jsonable_python
 from fastmcp import FastMCP, Context
 from prometheus_mcp_server.logging_config import get_logger
 
-dotenv.load_dotenv()
-mcp = FastMCP("Prometheus MCP")
-
-# Cache for metrics list to improve completion performance
-_metrics_cache = {"data": None, "timestamp": 0}
+# Library consumers and test runs can opt out of reading .env at import time
+SKIP_DOTENV = os.environ.get("PROMETHEUS_MCP_SKIP_DOTENV", "False").lower() in ("true", "1", "yes")
+if not SKIP_DOTENV:
+    import dotenv
+    dotenv.load_dotenv()
+
+# HTTP clients keyed by (Prometheus URL, SSL verification setting), so each target keeps its own
+# keep-alive pool and a slow target cannot exhaust the connections used for the others
+_http_clients: Dict[Tuple[Optional[str], bool], httpx.AsyncClient] = {}
+_MAX_HTTP_CLIENTS = 32  # distinct targets beyond this share one fallback client per verify setting
+_active_sessions = 0
+
+# Retry policy for transient upstream failures
+_MAX_RETRIES = 3
+_RETRY_BACKOFF = 0.2  # seconds, doubled on every attempt
+_RETRY_STATUSES = frozenset({502, 503, 504})
+# Request headers that make a GET conditional, so a 304 answer is expected
+_CONDITIONAL_HEADERS = frozenset({"If-None-Match", "If-Modified-Since"})
+
+def _get_http_client(verify: bool, base_url: Optional[str] = None) -> httpx.AsyncClient:
+    """Get the pooled async HTTP client for a Prometheus target and SSL verification setting.
+
+    Clients are created once per target and reused for the life of the process. Once
+    _MAX_HTTP_CLIENTS targets have clients, further targets share a fallback client.
+    """
+    key = (base_url, verify)
+    client = _http_clients.get(key)
+    if client is None and base_url is not None and len(_http_clients) >= _MAX_HTTP_CLIENTS:
+        key = (None, verify)
+        client = _http_clients.get(key)
+    if client is None or client.is_closed:
+        # Keep-alive pool with connection-level retries; status-level retries are in make_prometheus_request
+        transport = httpx.AsyncHTTPTransport(
+            verify=verify,
+            retries=_MAX_RETRIES,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+        )
+        client = httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(10.0, connect=3.05))
+        _http_clients[key] = client
+    return client
+
+async def close_http_clients():
+    """Close all shared HTTP clients and their pooled connections."""
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+@asynccontextmanager
+async def _lifespan(server):
+    """Close the shared HTTP clients once the last MCP session shuts down."""
+    global _active_sessions
+    _active_sessions += 1
+    try:
+        yield {}
+    finally:
+        _active_sessions -= 1
+        if not _active_sessions:
+            await close_http_clients()
+
+# Values orjson can't encode natively (e.g. pydantic models) go through pydantic like FastMCP's default serializer
+_jsonable_fallback = functools.partial(to_jsonable_python, fallback=str)
+
+def _serialize_tool_result(data: Any) -> str:
+    """Serialize tool results with orjson, falling back to pydantic's JSON conversion for other types."""
+    return orjson.dumps(data, default=_jsonable_fallback, option=orjson.OPT_NON_STR_KEYS).decode()
+
+mcp = FastMCP("Prometheus MCP", lifespan=_lifespan, tool_serializer=_serialize_tool_result)
+
+@dataclass(slots=True)
+class _MetricsCacheEntry:
+    """A cached metrics list with its fetch time and revalidation state."""
+    data: List[str]
+    timestamp: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+# LRU cache of metrics lists keyed by Prometheus URL to improve completion performance
+_metrics_cache: "OrderedDict[str, _MetricsCacheEntry]" = OrderedDict()
+# Per-URL refresh locks, an LRU bounded like the cache itself
+_metrics_cache_locks: "OrderedDict[str, asyncio.Lock]" = OrderedDict()
 _CACHE_TTL = 300  # 5 minutes
+_CACHE_MAX_ENTRIES = 64
 
 # Get logger instance
 logger = get_logger()
+# Stdlib logger behind the structlog one, used to skip building debug events when DEBUG is off
+_stdlib_logger = logging.getLogger("prometheus_mcp_server")
+
+async def _probe_prometheus(
+    prometheus_url: Optional[str],
+    probe_time: str,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    token: Optional[str] = None
+) -> Dict[str, Any]:
+    """Run a bounded connectivity probe against one Prometheus server.
+
+    Returns:
+        The connectivity status, plus the error message if the probe failed or timed out
+    """
+    try:
+        await asyncio.wait_for(
+            make_prometheus_request("query", params={"query": "up", "time": probe_time}, prometheus_url=prometheus_url, username=username, password=password, token=token),
+            timeout=config.health_check_timeout,
+        )
+        return {"prometheus_connectivity": "healthy"}
+    except asyncio.TimeoutError:
+        return {"prometheus_connectivity": "unhealthy", "prometheus_error": f"Connectivity check timed out after {config.health_check_timeout}s"}
+    except Exception as e:
+        return {"prometheus_connectivity": "unhealthy", "prometheus_error": str(e)}
 
 # Health check tool for Docker containers and monitoring
 @mcp.tool(
@@ -39,7 +151,8 @@ async def health_check(
     prometheus_url: Optional[str] = None,
     username: Optional[str] = None,
     password: Optional[str] = None,
-    token: Optional[str] = None
+    token: Optional[str] = None,
+    prometheus_urls: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """Return health status of the MCP server and Prometheus connection.
     
@@ -48,6 +161,7 @@ async def health_check(
         username: Optional username for basic authentication. If not provided, uses configured credentials.
         password: Optional password for basic authentication. If not provided, uses configured credentials.
         token: Optional bearer token for authentication. If not provided, uses configured credentials.
+        prometheus_urls: Optional list of Prometheus URLs to check concurrently. Takes precedence over prometheus_url.
 
     Returns:
         Health status including service information, configuration, and connectivity
@@ -60,7 +174,7 @@ async def health_check(
             "status": "healthy",
             "service": "prometheus-mcp-server",
             "version": "1.5.1",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
             "transport": config.mcp_server_config.mcp_server_transport if config.mcp_server_config else "stdio",
             "configuration": {
                 "prometheus_url_configured": bool(config.url),
@@ -68,17 +182,28 @@ async def health_check(
                 "org_id_configured": bool(config.org_id)
             }
         }
+        probe_time = str(time.time_ns() // 1_000_000_000)
         
+        if prometheus_urls:
+            # Probe every server at once so the check takes as long as the slowest one, not the sum
+            urls = list(dict.fromkeys(prometheus_urls))
+            if len(urls) == 1:
+                # A single target needs no fan-out; probe it directly
+                probes = [await _probe_prometheus(urls[0], probe_time, username=username, password=password, token=token)]
+            else:
+                probes = await asyncio.gather(
+                    *(_probe_prometheus(url, probe_time, username=username, password=password, token=token) for url in urls)
+                )
+            health_status["targets"] = dict(zip(urls, probes))
+            if any(probe["prometheus_connectivity"] != "healthy" for probe in probes):
+                health_status["status"] = "degraded"
         # Test Prometheus connectivity if URL available
-        if test_url:
-            try:
-                # Quick connectivity test
-                make_prometheus_request("query", params={"query": "up", "time": str(int(time.time()))}, prometheus_url=prometheus_url, username=username, password=password, token=token)
-                health_status["prometheus_connectivity"] = "healthy"
+        elif test_url:
+            probe = await _probe_prometheus(prometheus_url, probe_time, username=username, password=password, token=token)
+            health_status.update(probe)
+            if probe["prometheus_connectivity"] == "healthy":
                 health_status["prometheus_url"] = test_url
-            except Exception as e:
-                health_status["prometheus_connectivity"] = "unhealthy"
-                health_status["prometheus_error"] = str(e)
+            else:
                 health_status["status"] = "degraded"
         else:
             health_status["status"] = "unhealthy"
@@ -93,7 +218,7 @@ async def health_check(
             "status": "unhealthy",
             "service": "prometheus-mcp-server",
             "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")
         }
 
 
@@ -110,12 +235,14 @@ class TransportType(str, Enum):
         """Get all valid transport values."""
         return [transport.value for transport in cls]
 
-@dataclass
+_TRANSPORT_VALUES = frozenset(transport.value for transport in TransportType)
+
+@dataclass(slots=True, frozen=True)
 class MCPServerConfig:
     """Global Configuration for MCP."""
     mcp_server_transport: TransportType = None
     mcp_bind_host: str = None
-    mcp_bind_port: int = None
+    mcp_bind_port: Union[str, int] = None
 
     def __post_init__(self):
         """Validate mcp configuration."""
@@ -126,7 +253,10 @@ class MCPServerConfig:
         if not self.mcp_bind_port:
             raise ValueError(f"MCP BIND PORT is required")
 
-@dataclass
+# Config fields the prepared default request headers and auth are built from
+_AUTH_CONFIG_FIELDS = frozenset({"username", "password", "token", "org_id", "custom_headers"})
+
+@dataclass(slots=True)
 class PrometheusConfig:
     url: Optional[str] = None
     url_ssl_verify: bool = True
@@ -141,21 +271,53 @@ class PrometheusConfig:
     mcp_server_config: Optional[MCPServerConfig] = None
     # Optional custom headers for Prometheus requests
     custom_headers: Optional[Dict[str, str]] = None
+    # Seconds to wait for the Prometheus connectivity probe in health_check
+    health_check_timeout: float = 5.0
+    # Headers and auth prepared for the configured credentials, dropped whenever one of them changes
+    _default_auth: Optional[Tuple[Mapping[str, str], Optional[httpx.Auth]]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in _AUTH_CONFIG_FIELDS:
+            object.__setattr__(self, "_default_auth", None)
+
+@functools.lru_cache(maxsize=256)
+def _canonical_url(url: str) -> str:
+    """Canonicalize a Prometheus URL so equivalent spellings share one cache key.
+
+    Scheme and host are case-insensitive and a trailing slash does not change the target.
+    Credentials embedded in the URL are left untouched.
+    """
+    parts = urlsplit(url)
+    netloc = parts.netloc if "@" in parts.netloc else parts.netloc.lower()
+    return urlunsplit((parts.scheme.lower(), netloc, parts.path.rstrip("/"), parts.query, parts.fragment))
+
+# Environment variable names the server reads; startswith() checks the whole tuple in one call
+_ENV_PREFIXES = ("PROMETHEUS_", "ORG_ID")
+
+def _read_env() -> Dict[str, str]:
+    """Collect the server's environment variables in a single pass over os.environ."""
+    return {key: value for key, value in os.environ.items() if key.startswith(_ENV_PREFIXES)}
+
+_env = _read_env()
 
 config = PrometheusConfig(
-    url=os.environ.get("PROMETHEUS_URL") or None,
-    url_ssl_verify=os.environ.get("PROMETHEUS_URL_SSL_VERIFY", "True").lower() in ("true", "1", "yes"),
-    disable_prometheus_links=os.environ.get("PROMETHEUS_DISABLE_LINKS", "False").lower() in ("true", "1", "yes"),
-    username=os.environ.get("PROMETHEUS_USERNAME") or None,
-    password=os.environ.get("PROMETHEUS_PASSWORD") or None,
-    token=os.environ.get("PROMETHEUS_TOKEN") or None,
-    org_id=os.environ.get("ORG_ID") or None,
+    # Canonicalized once here so per-request lookups of the default URL need no normalization
+    url=_canonical_url(_env["PROMETHEUS_URL"]) if _env.get("PROMETHEUS_URL") else None,
+    url_ssl_verify=_env.get("PROMETHEUS_URL_SSL_VERIFY", "True").lower() in ("true", "1", "yes"),
+    disable_prometheus_links=_env.get("PROMETHEUS_DISABLE_LINKS", "False").lower() in ("true", "1", "yes"),
+    username=_env.get("PROMETHEUS_USERNAME") or None,
+    password=_env.get("PROMETHEUS_PASSWORD") or None,
+    token=_env.get("PROMETHEUS_TOKEN") or None,
+    org_id=_env.get("ORG_ID") or None,
     mcp_server_config=MCPServerConfig(
-        mcp_server_transport=os.environ.get("PROMETHEUS_MCP_SERVER_TRANSPORT", "stdio").lower(),
-        mcp_bind_host=os.environ.get("PROMETHEUS_MCP_BIND_HOST", "127.0.0.1"),
-        mcp_bind_port=int(os.environ.get("PROMETHEUS_MCP_BIND_PORT", "8080"))
+        mcp_server_transport=_env.get("PROMETHEUS_MCP_SERVER_TRANSPORT", "stdio").lower(),
+        mcp_bind_host=_env.get("PROMETHEUS_MCP_BIND_HOST", "127.0.0.1"),
+        # Coerced to int once by the settings validation in main.setup_environment()
+        mcp_bind_port=_env.get("PROMETHEUS_MCP_BIND_PORT", "8080")
     ),
-    custom_headers=json.loads(os.environ.get("PROMETHEUS_CUSTOM_HEADERS")) if os.environ.get("PROMETHEUS_CUSTOM_HEADERS") else None,
+    custom_headers=json.loads(_env["PROMETHEUS_CUSTOM_HEADERS"]) if _env.get("PROMETHEUS_CUSTOM_HEADERS") else None,
+    health_check_timeout=float(_env.get("PROMETHEUS_HEALTH_CHECK_TIMEOUT", "5.0")),
 )
 
 def get_prometheus_auth(username: Optional[str] = None, password: Optional[str] = None, token: Optional[str] = None):
@@ -177,10 +339,65 @@ def get_prometheus_auth(username: Optional[str] = None, password: Optional[str]
     if use_token:
         return {"Authorization": f"Bearer {use_token}"}
     elif use_username and use_password:
-        return requests.auth.HTTPBasicAuth(use_username, use_password)
+        return httpx.BasicAuth(use_username, use_password)
     return None
 
-def make_prometheus_request(endpoint, params=None, prometheus_url: Optional[str] = None, username: Optional[str] = None, password: Optional[str] = None, token: Optional[str] = None):
+@functools.lru_cache(maxsize=64)
+def _graph_url_prefix(base_url: str) -> str:
+    """Get the Prometheus UI graph URL prefix for a Prometheus base URL."""
+    return f"{base_url.rstrip('/')}/graph?"
+
+def _request_auth(
+    token: Optional[str],
+    username: Optional[str],
+    password: Optional[str],
+    org_id: Optional[str],
+    custom_headers: Optional[Mapping[str, str]],
+    encode_basic: bool = False,
+) -> Tuple[Mapping[str, str], Optional[httpx.Auth]]:
+    """Build the request headers and auth for a set of credentials.
+
+    Not cached, so per-call credential overrides are not kept alive after the request; the
+    configured credentials are prepared once by _default_request_auth().
+
+    Args:
+        encode_basic: Send basic auth as a prebuilt Authorization header instead of an auth object.
+            Only used for the configured credentials, so no ready-to-use header is built from overrides.
+
+    Returns:
+        Read-only headers mapping and the auth object to pass with the request (or None)
+    """
+    auth = get_prometheus_auth(username=username, password=password, token=token)
+    headers = {}
+
+    if isinstance(auth, dict):  # Token auth is passed via headers
+        headers.update(auth)
+        auth = None  # Clear auth for the request if it's already in headers
+    elif auth is not None and encode_basic:  # Encode basic auth once instead of on every request
+        credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+        headers["Authorization"] = f"Basic {credentials}"
+        auth = None
+    
+    # Add OrgID header if specified
+    if org_id:
+        headers["X-Scope-OrgID"] = org_id
+
+    if custom_headers:
+        headers.update(custom_headers)
+
+    return MappingProxyType(headers), auth
+
+def _default_request_auth() -> Tuple[Mapping[str, str], Optional[httpx.Auth]]:
+    """Get the headers and auth for the configured credentials, prepared once per config change."""
+    prepared = config._default_auth
+    if prepared is None:
+        prepared = _request_auth(
+            config.token, config.username, config.password, config.org_id, config.custom_headers, encode_basic=True
+        )
+        config._default_auth = prepared
+    return prepared
+
+async def make_prometheus_request(endpoint, params=None, prometheus_url: Optional[str] = None, username: Optional[str] = None, password: Optional[str] = None, token: Optional[str] = None, extra_headers: Optional[Mapping[str, str]] = None, response_headers: Optional[Dict[str, str]] = None):
     """Make a request to the Prometheus API with proper authentication and headers.
     
     Args:
@@ -190,6 +407,11 @@ def make_prometheus_request(endpoint, params=None, prometheus_url: Optional[str]
         username: Optional username for basic auth (overrides config)
         password: Optional password for basic auth (overrides config)
         token: Optional bearer token (overrides config)
+        extra_headers: Optional headers to send with this request only (e.g. conditional GET validators)
+        response_headers: Optional dict that receives the response's ETag and Last-Modified headers
+
+    Returns:
+        The response data field, or None if extra_headers carried validators and the server answered 304 Not Modified
     """
     # Use provided URL or fall back to configured URL
     base_url = prometheus_url or config.url
@@ -198,82 +420,174 @@ def make_prometheus_request(endpoint, params=None, prometheus_url: Optional[str]
         logger.error("Prometheus URL missing", error="No prometheus_url provided and PROMETHEUS_URL not set")
         raise ValueError("Prometheus URL is required. Provide prometheus_url parameter or set PROMETHEUS_URL environment variable.")
     
-    if not config.url_ssl_verify:
-        logger.warning("SSL certificate verification is disabled. This is insecure and should not be used in production environments.", endpoint=endpoint)
-
-    url = f"{base_url.rstrip('/')}/api/v1/{endpoint}"
     url_ssl_verify = config.url_ssl_verify
-    auth = get_prometheus_auth(username=username, password=password, token=token)
-    headers = {}
-
-    if isinstance(auth, dict):  # Token auth is passed via headers
-        headers.update(auth)
-        auth = None  # Clear auth for requests.get if it's already in headers
-    
-    # Add OrgID header if specified
-    if config.org_id:
-        headers["X-Scope-OrgID"] = config.org_id
+    if not url_ssl_verify:
+        logger.warning("SSL certificate verification is disabled. This is insecure and should not be used in production environments.", endpoint=endpoint)
 
-    if config.custom_headers:
-        headers.update(config.custom_headers)
+    # One memoized lookup resolves both the configured and an explicit target; canonical URLs carry no trailing slash
+    target = _canonical_url(base_url)
+    url = f"{target}/api/v1/{endpoint}"
+    if token is None and username is None and password is None:
+        headers, auth = _default_request_auth()
+    else:
+        headers, auth = _request_auth(
+            token if token is not None else config.token,
+            username if username is not None else config.username,
+            password if password is not None else config.password,
+            config.org_id,
+            config.custom_headers,
+        )
+    if extra_headers:
+        headers = {**headers, **extra_headers}
 
     try:
-        logger.debug("Making Prometheus API request", endpoint=endpoint, url=url, params=params, headers=headers)
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Making Prometheus API request", endpoint=endpoint, url=url, params=params, headers=headers)
 
         # Make the request with appropriate headers and auth
-        response = requests.get(url, params=params, auth=auth, headers=headers, verify=url_ssl_verify)
+        client = _get_http_client(url_ssl_verify, target)
+        for attempt in range(_MAX_RETRIES + 1):
+            response = await client.get(url, params=params, auth=auth, headers=headers)
+            if response.status_code not in _RETRY_STATUSES or attempt == _MAX_RETRIES:
+                break
+            logger.warning("Retrying Prometheus API request", endpoint=endpoint, status_code=response.status_code, attempt=attempt + 1)
+            await asyncio.sleep(_RETRY_BACKOFF * 2 ** attempt)
         
+        # Only a conditional request can be answered "not modified"; any other 304 is an error below
+        if response.status_code == 304 and extra_headers and _CONDITIONAL_HEADERS.intersection(extra_headers):
+            if _stdlib_logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Prometheus API resource not modified", endpoint=endpoint)
+            return None
+
         response.raise_for_status()
-        result = response.json()
+        if response_headers is not None:
+            for name in ("ETag", "Last-Modified"):
+                value = response.headers.get(name)
+                if value:
+                    response_headers[name] = value
+        result = orjson.loads(response.content)
         
         if result["status"] != "success":
             error_msg = result.get('error', 'Unknown error')
             logger.error("Prometheus API returned error", endpoint=endpoint, error=error_msg, status=result["status"])
             raise ValueError(f"Prometheus API error: {error_msg}")
         
-        data_field = result.get("data", {})
-        if isinstance(data_field, dict):
-            result_type = data_field.get("resultType")
-        else:
-            result_type = "list"
-        logger.debug("Prometheus API request successful", endpoint=endpoint, result_type=result_type)
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            data_field = result.get("data", {})
+            if isinstance(data_field, dict):
+                result_type = data_field.get("resultType")
+            else:
+                result_type = "list"
+            logger.debug("Prometheus API request successful", endpoint=endpoint, result_type=result_type)
         return result["data"]
     
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error("HTTP request to Prometheus failed", endpoint=endpoint, url=url, error=str(e), error_type=type(e).__name__)
         raise
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error("Failed to parse Prometheus response as JSON", endpoint=endpoint, url=url, error=str(e))
         raise ValueError(f"Invalid JSON response from Prometheus: {str(e)}")
     except Exception as e:
         logger.error("Unexpected error during Prometheus request", endpoint=endpoint, url=url, error=str(e), error_type=type(e).__name__)
         raise
 
-def get_cached_metrics() -> List[str]:
+def _metrics_cache_lock(cache_key: str) -> asyncio.Lock:
+    """Get the refresh lock for a metrics cache key.
+
+    Least recently used locks are dropped once there are more than _CACHE_MAX_ENTRIES, but never
+    while held, so every coroutine refreshing a URL keeps sharing the same lock.
+    """
+    lock = _metrics_cache_locks.get(cache_key)
+    if lock is not None:
+        _metrics_cache_locks.move_to_end(cache_key)
+        return lock
+
+    lock = _metrics_cache_locks[cache_key] = asyncio.Lock()
+    excess = len(_metrics_cache_locks) - _CACHE_MAX_ENTRIES
+    if excess > 0:
+        idle = [key for key, other in _metrics_cache_locks.items() if key != cache_key and not other.locked()]
+        for key in idle[:excess]:
+            del _metrics_cache_locks[key]
+    return lock
+
+async def get_cached_metrics(prometheus_url: Optional[str] = None, stale_ok: bool = True) -> List[str]:
     """Get metrics list with caching to improve completion performance.
 
     This helper function is available for future completion support when
     FastMCP implements the completion capability. For now, it can be used
     internally to optimize repeated metric list requests.
+
+    Cache entries are timestamped only when written, so reads never extend
+    their lifetime.
+
+    Args:
+        prometheus_url: Optional Prometheus URL to list metrics for. If not provided, uses the configured URL.
+        stale_ok: Whether an expired list may be returned when refreshing fails. If False, the error is raised.
     """
+    cache_key = _canonical_url(prometheus_url or config.url) if (prometheus_url or config.url) else ""
     current_time = time.time()
 
     # Check if cache is valid
-    if _metrics_cache["data"] is not None and (current_time - _metrics_cache["timestamp"]) < _CACHE_TTL:
-        logger.debug("Using cached metrics list", cache_age=current_time - _metrics_cache["timestamp"])
-        return _metrics_cache["data"]
-
-    # Fetch fresh metrics
-    try:
-        data = make_prometheus_request("label/__name__/values")
-        _metrics_cache["data"] = data
-        _metrics_cache["timestamp"] = current_time
-        logger.debug("Refreshed metrics cache", metric_count=len(data))
+    entry = _metrics_cache.get(cache_key)
+    if entry is not None and (current_time - entry.timestamp) < _CACHE_TTL:
+        _metrics_cache.move_to_end(cache_key)
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Using cached metrics list", cache_age=current_time - entry.timestamp)
+        return entry.data
+
+    # Only one coroutine per URL refreshes the cache; concurrent callers wait and reuse its result
+    lock = _metrics_cache_lock(cache_key)
+    async with lock:
+        current_time = time.time()
+        entry = _metrics_cache.get(cache_key)
+        if entry is not None and (current_time - entry.timestamp) < _CACHE_TTL:
+            return entry.data
+
+        # Revalidate an expired entry with its validators so an unchanged list is not re-downloaded
+        validators = {}
+        if entry is not None:
+            if entry.etag:
+                validators["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                validators["If-Modified-Since"] = entry.last_modified
+
+        # Fetch fresh metrics
+        response_headers = {}
+        try:
+            data = await make_prometheus_request(
+                "label/__name__/values",
+                prometheus_url=cache_key or None,
+                extra_headers=validators or None,
+                response_headers=response_headers,
+            )
+        except Exception as e:
+            logger.error("Failed to fetch metrics for cache", error=str(e))
+            if not stale_ok:
+                raise
+            if entry is None:
+                return []
+            # Return cached data even if expired, but leave its timestamp alone so the next call retries
+            logger.warning("Serving stale metrics list", served_stale=True, cache_age_seconds=current_time - entry.timestamp)
+            return entry.data
+
+        if data is None:
+            if _stdlib_logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Metrics list not modified, revalidated cache", cache_key=cache_key)
+            data = entry.data
+            response_headers = {"ETag": entry.etag, "Last-Modified": entry.last_modified}
+
+        _metrics_cache[cache_key] = _MetricsCacheEntry(
+            data=data,
+            timestamp=current_time,
+            etag=response_headers.get("ETag"),
+            last_modified=response_headers.get("Last-Modified"),
+        )
+        _metrics_cache.move_to_end(cache_key)
+        while len(_metrics_cache) > _CACHE_MAX_ENTRIES:
+            _metrics_cache.popitem(last=False)
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Refreshed metrics cache", metric_count=len(data))
         return data
-    except Exception as e:
-        logger.error("Failed to fetch metrics for cache", error=str(e))
-        # Return cached data if available, even if expired
-        return _metrics_cache["data"] if _metrics_cache["data"] is not None else []
 
 # Note: Argument completions will be added when FastMCP supports the completion
 # capability. The get_cached_metrics() function above is ready for that integration.
@@ -314,8 +628,10 @@ async def execute_query(
     if time:
         params["time"] = time
     
-    logger.info("Executing instant query", query=query, time=time, prometheus_url=prometheus_url)
-    data = make_prometheus_request("query", params=params, prometheus_url=prometheus_url, username=username, password=password, token=token)
+    # Resolve the target once; it is reused for the request and the UI link
+    base_url = prometheus_url or config.url
+    logger.info("Executing instant query", query=query, time=time, prometheus_url=base_url)
+    data = await make_prometheus_request("query", params=params, prometheus_url=base_url, username=username, password=password, token=token)
 
     result = {
         "resultType": data["resultType"],
@@ -323,13 +639,10 @@ async def execute_query(
     }
 
     if not config.disable_prometheus_links:
-        from urllib.parse import urlencode
-        # Use provided URL or fall back to configured URL for UI link
-        base_url = prometheus_url or config.url
         ui_params = {"g0.expr": query, "g0.tab": "0"}
         if time:
             ui_params["g0.moment_input"] = time
-        prometheus_ui_link = f"{base_url.rstrip('/')}/graph?{urlencode(ui_params)}"
+        prometheus_ui_link = f"{_graph_url_prefix(base_url)}{urlencode(ui_params)}"
         result["links"] = [{
             "href": prometheus_ui_link,
             "rel": "prometheus-ui",
@@ -343,6 +656,58 @@ async def execute_query(
 
     return result
 
+@mcp.tool(
+    description="Execute a PromQL instant query against several Prometheus servers concurrently",
+    annotations={
+        "title": "Execute PromQL Query on Multiple Servers",
+        "icon": "🌐",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+async def execute_query_multi(
+    query: str,
+    prometheus_urls: Optional[List[str]] = None,
+    time: Optional[str] = None,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    token: Optional[str] = None
+) -> Dict[str, Any]:
+    """Execute the same instant query against several Prometheus servers at once.
+
+    Args:
+        query: PromQL query string
+        prometheus_urls: Prometheus URLs to query. If not provided, uses the configured URL.
+        time: Optional RFC3339 or Unix timestamp (default: current time)
+        username: Optional username for basic authentication. If not provided, uses configured credentials.
+        password: Optional password for basic authentication. If not provided, uses configured credentials.
+        token: Optional bearer token for authentication. If not provided, uses configured credentials.
+
+    Returns:
+        Per-URL query results and a list of the URLs that failed with their errors
+    """
+    urls = list(dict.fromkeys(prometheus_urls)) if prometheus_urls else [config.url]
+    logger.info("Executing multi-server instant query", query=query, time=time, prometheus_urls=urls)
+
+    outcomes = await asyncio.gather(
+        *(execute_query.fn(query, time=time, prometheus_url=url, username=username, password=password, token=token) for url in urls),
+        return_exceptions=True,
+    )
+
+    results = {}
+    errors = []
+    for url, outcome in zip(urls, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append({"prometheus_url": url, "error": str(outcome), "error_type": type(outcome).__name__})
+        else:
+            results[url] = outcome
+
+    logger.info("Multi-server instant query completed", query=query, succeeded=len(results), failed=len(errors))
+
+    return {"results": results, "errors": errors}
+
 @mcp.tool(
     description="Execute a PromQL range query with start time, end time, and step interval",
     annotations={
@@ -387,13 +752,15 @@ async def execute_range_query(
         "step": step
     }
 
-    logger.info("Executing range query", query=query, start=start, end=end, step=step, prometheus_url=prometheus_url)
+    # Resolve the target once; it is reused for the request and the UI link
+    base_url = prometheus_url or config.url
+    logger.info("Executing range query", query=query, start=start, end=end, step=step, prometheus_url=base_url)
 
     # Report progress if context available
     if ctx:
         await ctx.report_progress(progress=0, total=100, message="Initiating range query...")
 
-    data = make_prometheus_request("query_range", params=params, prometheus_url=prometheus_url, username=username, password=password, token=token)
+    data = await make_prometheus_request("query_range", params=params, prometheus_url=base_url, username=username, password=password, token=token)
 
     # Report progress
     if ctx:
@@ -405,16 +772,13 @@ async def execute_range_query(
     }
 
     if not config.disable_prometheus_links:
-        from urllib.parse import urlencode
-        # Use provided URL or fall back to configured URL for UI link
-        base_url = prometheus_url or config.url
         ui_params = {
             "g0.expr": query,
             "g0.tab": "0",
             "g0.range_input": f"{start} to {end}",
             "g0.step_input": step
         }
-        prometheus_ui_link = f"{base_url.rstrip('/')}/graph?{urlencode(ui_params)}"
+        prometheus_ui_link = f"{_graph_url_prefix(base_url)}{urlencode(ui_params)}"
         result["links"] = [{
             "href": prometheus_ui_link,
             "rel": "prometheus-ui",
@@ -478,30 +842,36 @@ async def list_metrics(
     if ctx:
         await ctx.report_progress(progress=0, total=100, message="Fetching metrics list...")
 
-    data = make_prometheus_request("label/__name__/values", prometheus_url=prometheus_url, username=username, password=password, token=token)
+    data = await make_prometheus_request("label/__name__/values", prometheus_url=prometheus_url, username=username, password=password, token=token)
 
     if ctx:
         await ctx.report_progress(progress=50, total=100, message=f"Processing {len(data)} metrics...")
 
-    # Apply filter if provided
+    # Apply filter and pagination in a single pass so the filtered list is never materialized
+    end_idx = offset + limit if limit is not None else None
     if filter_pattern:
-        filtered_data = [m for m in data if filter_pattern.lower() in m.lower()]
-        logger.debug("Applied filter", original_count=len(data), filtered_count=len(filtered_data), pattern=filter_pattern)
-        data = filtered_data
-
-    total_count = len(data)
-
-    # Apply pagination
-    start_idx = offset
-    end_idx = offset + limit if limit is not None else len(data)
-    paginated_data = data[start_idx:end_idx]
+        # Case-insensitive substring match without lower-casing every metric name
+        matches = re.compile(re.escape(filter_pattern), re.IGNORECASE).search
+        paginated_data = []
+        total_count = 0
+        for metric in data:
+            if matches(metric):
+                if total_count >= offset and (end_idx is None or total_count < end_idx):
+                    paginated_data.append(metric)
+                total_count += 1
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Applied filter", original_count=len(data), filtered_count=total_count, pattern=filter_pattern)
+    else:
+        total_count = len(data)
+        # The list is freshly fetched and never mutated, so the unpaginated case can return it as-is
+        paginated_data = data if offset == 0 and end_idx is None else data[offset:end_idx]
 
     result = {
         "metrics": paginated_data,
         "total_count": total_count,
         "returned_count": len(paginated_data),
         "offset": offset,
-        "has_more": end_idx < total_count
+        "has_more": end_idx is not None and end_idx < total_count
     }
 
     if ctx:
@@ -546,8 +916,7 @@ async def get_metric_metadata(
         List of metadata entries for the metric
     """
     logger.info("Retrieving metric metadata", metric=metric, prometheus_url=prometheus_url)
-    endpoint = f"metadata?metric={metric}"
-    data = make_prometheus_request(endpoint, params=None, prometheus_url=prometheus_url, username=username, password=password, token=token)
+    data = await make_prometheus_request("metadata", params={"metric": metric}, prometheus_url=prometheus_url, username=username, password=password, token=token)
     if "metadata" in data:
         metadata = data["metadata"]
     elif "data" in data:
@@ -588,7 +957,7 @@ async def get_targets(
         Dictionary with active and dropped targets information
     """
     logger.info("Retrieving scrape targets information", prometheus_url=prometheus_url)
-    data = make_prometheus_request("targets", prometheus_url=prometheus_url, username=username, password=password, token=token)
+    data = await make_prometheus_request("targets", prometheus_url=prometheus_url, username=username, password=password, token=token)
     
     result = {
         "activeTargets": data["activeTargets"],
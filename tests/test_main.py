@@ -4,7 +4,16 @@ import os
 import pytest
 from unittest.mock import patch, MagicMock
 from prometheus_mcp_server.server import MCPServerConfig
-from prometheus_mcp_server.main import setup_environment, run_server
+from prometheus_mcp_server.main import setup_environment, run_server, reset_dotenv_cache, _resolved_config, _mcp_settings
+
+@pytest.fixture(autouse=True)
+def clear_resolved_config():
+    """Drop the cached config snapshot so each test sees its own mocked config."""
+    _resolved_config.cache_clear()
+    _mcp_settings.cache_clear()
+    yield
+    _resolved_config.cache_clear()
+    _mcp_settings.cache_clear()
 
 @patch("prometheus_mcp_server.main.config")
 def test_setup_environment_success(mock_config):
@@ -204,10 +213,11 @@ def test_run_server_setup_failure(mock_exit, mock_run, mock_setup):
     mock_run.assert_not_called()
 
 @patch("prometheus_mcp_server.main.config")
-@patch("prometheus_mcp_server.main.dotenv.load_dotenv")
+@patch("dotenv.load_dotenv")
 def test_setup_environment_bearer_token_auth(mock_load_dotenv, mock_config):
     """Test environment setup with bearer token authentication."""
     # Setup
+    reset_dotenv_cache()
     mock_load_dotenv.return_value = False
     mock_config.url = "http://test:9090"
     mock_config.username = ""
@@ -222,6 +232,40 @@ def test_setup_environment_bearer_token_auth(mock_load_dotenv, mock_config):
     # Verify
     assert result is True
 
+@patch("prometheus_mcp_server.main.config")
+@patch("dotenv.load_dotenv")
+def test_setup_environment_loads_dotenv_once(mock_load_dotenv, mock_config):
+    """Test that repeated environment setup only parses the .env file once."""
+    # Setup
+    reset_dotenv_cache()
+    mock_load_dotenv.return_value = True
+    mock_config.url = "http://test:9090"
+    mock_config.username = None
+    mock_config.password = None
+    mock_config.token = None
+    mock_config.org_id = None
+    mock_config.mcp_server_config = None
+
+    # Execute
+    assert setup_environment() is True
+    assert setup_environment() is True
+
+    # Verify
+    mock_load_dotenv.assert_called_once()
+    reset_dotenv_cache()
+
+@patch("prometheus_mcp_server.main.SKIP_DOTENV", True)
+@patch("dotenv.load_dotenv")
+def test_load_dotenv_skipped_when_opted_out(mock_load_dotenv):
+    """Test that PROMETHEUS_MCP_SKIP_DOTENV bypasses reading the .env file."""
+    reset_dotenv_cache()
+
+    from prometheus_mcp_server.main import _load_dotenv_once
+    assert _load_dotenv_once() is False
+
+    mock_load_dotenv.assert_not_called()
+    reset_dotenv_cache()
+
 @patch("prometheus_mcp_server.main.setup_environment")
 @patch("prometheus_mcp_server.main.mcp.run")
 @patch("prometheus_mcp_server.main.config")
@@ -259,3 +303,96 @@ def test_run_server_sse_transport(mock_config, mock_run, mock_setup):
 
     # Verify
     mock_run.assert_called_once_with(transport="sse", host="0.0.0.0", port=9090)
+
+@patch("prometheus_mcp_server.main.config")
+def test_resolved_config_is_cached(mock_config):
+    """Test that the config snapshot is taken once and reused."""
+    # Setup
+    mock_config.url = "http://test:9090"
+    mock_config.mcp_server_config = MCPServerConfig(
+        mcp_server_transport="http",
+        mcp_bind_host="localhost",
+        mcp_bind_port=8080
+    )
+
+    # Execute
+    first = _resolved_config()
+    mock_config.url = "http://changed:9090"
+    second = _resolved_config()
+
+    # Verify
+    assert first is second
+    assert second.url == "http://test:9090"
+    assert second.mcp.port == 8080
+
+@patch("prometheus_mcp_server.main._log")
+@patch("prometheus_mcp_server.main.config")
+def test_setup_environment_emits_single_boot_event(mock_config, mock_log):
+    """Test that environment setup logs one structured boot summary."""
+    # Setup
+    mock_config.url = "http://test:9090"
+    mock_config.username = None
+    mock_config.password = None
+    mock_config.token = "token123"
+    mock_config.org_id = "org-1"
+    mock_config.mcp_server_config = MCPServerConfig(
+        mcp_server_transport="http",
+        mcp_bind_host="localhost",
+        mcp_bind_port=5000
+    )
+
+    # Execute
+    result = setup_environment()
+
+    # Verify
+    assert result is True
+    mock_log.return_value.info.assert_called_once()
+    event, fields = mock_log.return_value.info.call_args
+    assert event == ("prometheus_mcp_server.boot",)
+    assert fields["default_url"] == "http://test:9090"
+    assert fields["mcp_port"] == 5000
+    assert fields["org_id"] == "org-1"
+    assert fields["mode"] == "hybrid"
+
+@patch("prometheus_mcp_server.main._log")
+@patch("prometheus_mcp_server.main.setup_environment")
+@patch("prometheus_mcp_server.main.mcp.run")
+@patch("prometheus_mcp_server.main.config")
+def test_run_server_logs_start_before_blocking(mock_config, mock_run, mock_setup, mock_log):
+    """Test that the start event is logged before mcp.run blocks."""
+    # Setup
+    mock_setup.return_value = True
+    mock_config.mcp_server_config = MCPServerConfig(
+        mcp_server_transport="stdio",
+        mcp_bind_host="localhost",
+        mcp_bind_port=8080
+    )
+    mock_run.side_effect = lambda **kwargs: mock_log.return_value.info.assert_called_once_with(
+        "Starting Prometheus MCP Server", transport="stdio"
+    )
+
+    # Execute
+    run_server()
+
+    # Verify
+    mock_run.assert_called_once_with(transport="stdio")
+
+@patch("prometheus_mcp_server.main.setup_environment")
+@patch("prometheus_mcp_server.main.mcp.run")
+@patch("prometheus_mcp_server.main.config")
+def test_run_server_coerces_string_port(mock_config, mock_run, mock_setup):
+    """Test that a port read from the environment as a string is passed to mcp.run as an int."""
+    # Setup
+    mock_setup.return_value = True
+    mock_config.mcp_server_config = MCPServerConfig(
+        mcp_server_transport="http",
+        mcp_bind_host="localhost",
+        mcp_bind_port="8080"
+    )
+
+    # Execute
+    run_server()
+
+    # Verify
+    mock_run.assert_called_once_with(transport="http", host="localhost", port=8080)
+    assert isinstance(mock_run.call_args.kwargs["port"], int)
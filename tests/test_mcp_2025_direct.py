@@ -5,11 +5,13 @@ the MCP client, allowing us to test code paths that require direct context
 passing (like progress notifications with ctx parameter).
 """
 
+import asyncio
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime
 from prometheus_mcp_server.server import (
     execute_query,
+    execute_query_multi,
     execute_range_query,
     list_metrics,
     get_metric_metadata,
@@ -22,10 +24,11 @@ from prometheus_mcp_server.server import (
 
 
 @pytest.fixture
-def mock_make_request():
-    """Mock the make_prometheus_request function."""
-    with patch("prometheus_mcp_server.server.make_prometheus_request") as mock:
-        yield mock
+def mock_make_request(monkeypatch):
+    """Replace make_prometheus_request with an awaitable mock."""
+    mock = AsyncMock()
+    monkeypatch.setattr("prometheus_mcp_server.server.make_prometheus_request", mock)
+    return mock
 
 
 class TestDirectFunctionCalls:
@@ -48,6 +51,53 @@ class TestDirectFunctionCalls:
         assert result["links"][0]["rel"] == "prometheus-ui"
         assert "up" in result["links"][0]["href"]
 
+    @pytest.mark.asyncio
+    async def test_execute_query_resolves_url_once(self, mock_make_request):
+        """Test execute_query passes the resolved default URL down and reuses it for the UI link."""
+        mock_make_request.return_value = {"resultType": "vector", "result": []}
+
+        with patch("prometheus_mcp_server.server.config") as mock_config:
+            mock_config.url = "http://default:9090"
+            mock_config.disable_prometheus_links = False
+
+            result = await execute_query.fn(query="up")
+
+        assert mock_make_request.call_args.kwargs["prometheus_url"] == "http://default:9090"
+        assert result["links"][0]["href"].startswith("http://default:9090/graph?")
+
+    @pytest.mark.asyncio
+    async def test_execute_query_multi_fans_out_concurrently(self, mock_make_request):
+        """Test execute_query_multi queries every URL concurrently and collects failures."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_request(endpoint, params=None, prometheus_url=None, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if prometheus_url == "http://down:9090":
+                raise ValueError("Prometheus API error: unavailable")
+            return {"resultType": "vector", "result": [{"metric": {"instance": prometheus_url}, "value": [1, "1"]}]}
+
+        mock_make_request.side_effect = fake_request
+
+        result = await execute_query_multi.fn(
+            query="up",
+            prometheus_urls=["http://a:9090", "http://down:9090", "http://b:9090", "http://a:9090"],
+        )
+
+        assert peak == 3
+        assert mock_make_request.call_count == 3
+        assert list(result["results"]) == ["http://a:9090", "http://b:9090"]
+        assert result["results"]["http://b:9090"]["resultType"] == "vector"
+        assert result["errors"] == [{
+            "prometheus_url": "http://down:9090",
+            "error": "Prometheus API error: unavailable",
+            "error_type": "ValueError",
+        }]
+
     @pytest.mark.asyncio
     async def test_execute_range_query_with_context(self, mock_make_request):
         """Test execute_range_query with context for progress reporting."""
@@ -150,6 +200,41 @@ class TestDirectFunctionCalls:
         assert result["returned_count"] == 2
         assert "metric1" in result["metrics"]
 
+    @pytest.mark.asyncio
+    async def test_list_metrics_unpaginated_returns_fetched_list(self, mock_make_request):
+        """Test list_metrics does not copy the metrics list when no pagination is requested."""
+        metrics = ["up", "go_goroutines"]
+        mock_make_request.return_value = metrics
+
+        result = await list_metrics.fn(ctx=None)
+
+        assert result["metrics"] is metrics
+        assert result["has_more"] is False
+
+    @pytest.mark.asyncio
+    async def test_list_metrics_filter_with_pagination(self, mock_make_request):
+        """Test list_metrics filters and paginates in one pass."""
+        mock_make_request.return_value = [
+            "http_requests_total", "up", "HTTP_errors_total", "http_latency_seconds", "go_goroutines"
+        ]
+
+        result = await list_metrics.fn(filter_pattern="http", offset=1, limit=1, ctx=None)
+
+        assert result["metrics"] == ["HTTP_errors_total"]
+        assert result["total_count"] == 3
+        assert result["returned_count"] == 1
+        assert result["has_more"] is True
+
+    @pytest.mark.asyncio
+    async def test_list_metrics_filter_is_literal(self, mock_make_request):
+        """Test list_metrics treats the filter as a literal substring, not a regex."""
+        mock_make_request.return_value = ["node_cpu_seconds_total", "node.cpu", "nodeXcpu"]
+
+        result = await list_metrics.fn(filter_pattern="NODE.CPU", ctx=None)
+
+        assert result["metrics"] == ["node.cpu"]
+        assert result["total_count"] == 1
+
     @pytest.mark.asyncio
     async def test_get_metric_metadata_direct_call(self, mock_make_request):
         """Test get_metric_metadata by calling it directly."""
@@ -166,6 +251,17 @@ class TestDirectFunctionCalls:
         assert result[0]["metric"] == "up"
         assert result[0]["type"] == "gauge"
 
+    @pytest.mark.asyncio
+    async def test_get_metric_metadata_passes_metric_as_param(self, mock_make_request):
+        """Test get_metric_metadata leaves query-string encoding of the metric to the HTTP client."""
+        mock_make_request.return_value = {"metadata": []}
+
+        await get_metric_metadata.fn(metric="weird&name#1")
+
+        args, kwargs = mock_make_request.call_args
+        assert args == ("metadata",)
+        assert kwargs["params"] == {"metric": "weird&name#1"}
+
     @pytest.mark.asyncio
     async def test_get_metric_metadata_data_key(self, mock_make_request):
         """Test get_metric_metadata when data is in 'data' key instead of 'metadata'."""
@@ -284,6 +380,7 @@ class TestHealthCheckFunction:
             mock_config.username = "admin"
             mock_config.password = "secret"
             mock_config.org_id = None
+            mock_config.health_check_timeout = 5.0
             mock_config.mcp_server_config = MagicMock()
             mock_config.mcp_server_config.mcp_server_transport = "stdio"
 
@@ -297,6 +394,8 @@ class TestHealthCheckFunction:
             assert result["prometheus_url"] == "http://prometheus:9090"
             assert result["configuration"]["prometheus_url_configured"] is True
             assert result["configuration"]["authentication_configured"] is True
+            assert datetime.fromisoformat(result["timestamp"]).microsecond == 0
+            assert mock_make_request.call_args.kwargs["params"]["time"].isdigit()
 
     @pytest.mark.asyncio
     async def test_health_check_degraded_prometheus_error(self, mock_make_request):
@@ -309,6 +408,7 @@ class TestHealthCheckFunction:
             mock_config.password = None
             mock_config.token = None
             mock_config.org_id = None
+            mock_config.health_check_timeout = 5.0
             mock_config.mcp_server_config = MagicMock()
             mock_config.mcp_server_config.mcp_server_transport = "http"
 
@@ -319,6 +419,87 @@ class TestHealthCheckFunction:
             assert "prometheus_error" in result
             assert "Connection refused" in result["prometheus_error"]
 
+    @pytest.mark.asyncio
+    async def test_health_check_degraded_on_timeout(self, mock_make_request):
+        """Test health_check reports a slow Prometheus as degraded instead of hanging."""
+        async def slow_request(*args, **kwargs):
+            await asyncio.sleep(1)
+
+        mock_make_request.side_effect = slow_request
+
+        with patch("prometheus_mcp_server.server.config") as mock_config:
+            mock_config.url = "http://prometheus:9090"
+            mock_config.username = None
+            mock_config.password = None
+            mock_config.token = None
+            mock_config.org_id = None
+            mock_config.health_check_timeout = 0.01
+            mock_config.mcp_server_config = None
+
+            result = await health_check.fn()
+
+            assert result["status"] == "degraded"
+            assert result["prometheus_connectivity"] == "unhealthy"
+            assert "timed out" in result["prometheus_error"]
+
+    @pytest.mark.asyncio
+    async def test_health_check_probes_multiple_urls_concurrently(self, mock_make_request):
+        """Test health_check probes every listed URL at once and reports each one."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_request(endpoint, params=None, prometheus_url=None, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if prometheus_url == "http://down:9090":
+                raise ConnectionError("Connection refused")
+            return {"resultType": "vector", "result": []}
+
+        mock_make_request.side_effect = fake_request
+
+        with patch("prometheus_mcp_server.server.config") as mock_config:
+            mock_config.url = None
+            mock_config.username = None
+            mock_config.token = None
+            mock_config.org_id = None
+            mock_config.health_check_timeout = 5.0
+            mock_config.mcp_server_config = None
+
+            result = await health_check.fn(prometheus_urls=["http://a:9090", "http://down:9090", "http://b:9090"])
+
+        assert peak == 3
+        assert result["status"] == "degraded"
+        assert result["targets"]["http://a:9090"] == {"prometheus_connectivity": "healthy"}
+        assert result["targets"]["http://b:9090"] == {"prometheus_connectivity": "healthy"}
+        assert result["targets"]["http://down:9090"] == {
+            "prometheus_connectivity": "unhealthy",
+            "prometheus_error": "Connection refused",
+        }
+
+    @pytest.mark.asyncio
+    async def test_health_check_single_url_skips_fan_out(self, mock_make_request):
+        """Test health_check probes a single listed URL directly without gathering."""
+        mock_make_request.return_value = {"resultType": "vector", "result": []}
+
+        with patch("prometheus_mcp_server.server.config") as mock_config, \
+             patch("prometheus_mcp_server.server.asyncio.gather") as mock_gather:
+            mock_config.url = None
+            mock_config.username = None
+            mock_config.token = None
+            mock_config.org_id = None
+            mock_config.health_check_timeout = 5.0
+            mock_config.mcp_server_config = None
+
+            result = await health_check.fn(prometheus_urls=["http://a:9090", "http://a:9090"])
+
+        mock_gather.assert_not_called()
+        mock_make_request.assert_called_once()
+        assert result["status"] == "healthy"
+        assert result["targets"] == {"http://a:9090": {"prometheus_connectivity": "healthy"}}
+
     @pytest.mark.asyncio
     async def test_health_check_unhealthy_no_url(self):
         """Test health_check when PROMETHEUS_URL is not configured."""
@@ -328,6 +509,7 @@ class TestHealthCheckFunction:
             mock_config.password = None
             mock_config.token = None
             mock_config.org_id = None
+            mock_config.health_check_timeout = 5.0
             mock_config.mcp_server_config = MagicMock()
             mock_config.mcp_server_config.mcp_server_transport = "stdio"
 
@@ -352,6 +534,7 @@ class TestHealthCheckFunction:
             mock_config.password = None
             mock_config.token = "bearer-token-123"
             mock_config.org_id = "org-1"
+            mock_config.health_check_timeout = 5.0
             mock_config.mcp_server_config = MagicMock()
             mock_config.mcp_server_config.mcp_server_transport = "sse"
 
@@ -389,6 +572,7 @@ class TestHealthCheckFunction:
             mock_config.password = None
             mock_config.token = None
             mock_config.org_id = "tenant-123"
+            mock_config.health_check_timeout = 5.0
             mock_config.mcp_server_config = MagicMock()
             mock_config.mcp_server_config.mcp_server_transport = "stdio"
 
@@ -410,6 +594,7 @@ class TestHealthCheckFunction:
             mock_config.password = None
             mock_config.token = None
             mock_config.org_id = None
+            mock_config.health_check_timeout = 5.0
             mock_config.mcp_server_config = None
 
             result = await health_check.fn()
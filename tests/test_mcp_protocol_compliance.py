@@ -17,28 +17,28 @@ async def execute_query_wrapper(query: str, time=None):
     params = {"query": query}
     if time:
         params["time"] = time
-    data = make_prometheus_request("query", params=params)
+    data = await make_prometheus_request("query", params=params)
     return {"resultType": data["resultType"], "result": data["result"]}
 
 async def execute_range_query_wrapper(query: str, start: str, end: str, step: str):
     """Wrapper to test execute_range_query functionality."""  
     params = {"query": query, "start": start, "end": end, "step": step}
-    data = make_prometheus_request("query_range", params=params)
+    data = await make_prometheus_request("query_range", params=params)
     return {"resultType": data["resultType"], "result": data["result"]}
 
 async def list_metrics_wrapper():
     """Wrapper to test list_metrics functionality."""
-    return make_prometheus_request("label/__name__/values")
+    return await make_prometheus_request("label/__name__/values")
 
 async def get_metric_metadata_wrapper(metric: str):
     """Wrapper to test get_metric_metadata functionality."""
     params = {"metric": metric}
-    data = make_prometheus_request("metadata", params=params)
+    data = await make_prometheus_request("metadata", params=params)
     return data["data"][metric]
 
 async def get_targets_wrapper():
     """Wrapper to test get_targets functionality."""
-    data = make_prometheus_request("targets")
+    data = await make_prometheus_request("targets")
     return {"activeTargets": data["activeTargets"], "droppedTargets": data["droppedTargets"]}
 
 async def health_check_wrapper():
@@ -59,7 +59,7 @@ async def health_check_wrapper():
         
         if config.url:
             try:
-                make_prometheus_request("query", params={"query": "up", "time": str(int(datetime.utcnow().timestamp()))})
+                await make_prometheus_request("query", params={"query": "up", "time": str(int(datetime.utcnow().timestamp()))})
                 health_status["prometheus_connectivity"] = "healthy"
                 health_status["prometheus_url"] = config.url
             except Exception as e:
@@ -256,10 +256,10 @@ class TestMCPToolErrorHandling:
     @pytest.mark.asyncio
     async def test_execute_range_query_handles_network_errors(self, mock_request):
         """Test execute_range_query handles network errors gracefully."""
-        import requests
-        mock_request.side_effect = requests.exceptions.ConnectionError("Connection refused")
+        import httpx
+        mock_request.side_effect = httpx.ConnectError("Connection refused")
         
-        with pytest.raises(requests.exceptions.ConnectionError):
+        with pytest.raises(httpx.ConnectError):
             await execute_range_query_wrapper("up", "now-1h", "now", "1m")
     
     @patch('test_mcp_protocol_compliance.make_prometheus_request')
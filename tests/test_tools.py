@@ -163,7 +163,9 @@ async def test_get_metric_metadata(mock_make_request):
         print(json_data)
 
         # Verify
-        mock_make_request.assert_called_once_with("metadata?metric=up", params=None, prometheus_url=None)
+        mock_make_request.assert_called_once_with(
+            "metadata", params={"metric": "up"}, prometheus_url=None, username=None, password=None, token=None
+        )
         assert len(json_data) == 1
         assert json_data[0]["metric"] == "up"
         assert json_data[0]["type"] == "gauge"